@@ -11,6 +11,7 @@ from tkinter import scrolledtext, messagebox, filedialog
 import base64
 import os
 import json
+import bisect
 
 SERVER_HOST = "192.168.166.3"
 SERVER_PORT = 65432
@@ -28,6 +29,9 @@ class ChatClient:
         self.connected = False
         self.nickname = ""
         self.file_transfer_dir = "received_files"
+        self.roster = {}          # nickname -> status
+        self.roster_nicks = []    # nickname terurut, index sama dengan listbox
+        self.roster_version = None
         
         # Buat directory untuk file yang diterima
         if not os.path.exists(self.file_transfer_dir):
@@ -53,6 +57,13 @@ class ChatClient:
         )
         self.text_area.grid(row=0, column=0, columnspan=4, padx=10, pady=10, sticky="nsew")
 
+        # Roster panel (daftar user online)
+        self.frame_roster = tk.Frame(self.frame_chat, bg="#e9f1f6")
+        tk.Label(self.frame_roster, text="Online", font=("Arial", 10, "bold"), bg="#e9f1f6").pack(anchor="w")
+        self.list_roster = tk.Listbox(self.frame_roster, font=("Consolas", 10), width=18, activestyle="none")
+        self.list_roster.pack(fill=tk.BOTH, expand=True)
+        self.frame_roster.grid(row=0, column=4, padx=(0, 10), pady=10, sticky="nsew")
+
         # Input message
         self.entry_message = tk.Entry(self.frame_chat, font=("Arial", 11))
         self.entry_message.grid(row=1, column=0, padx=(10, 5), pady=(0, 10), sticky="ew")
@@ -189,6 +200,8 @@ class ChatClient:
                             msg_obj = json.loads(line)
                             if msg_obj.get('type') == 'FILE':
                                 self.master.after(0, lambda m=msg_obj: self.handle_received_file(m))
+                            elif msg_obj.get('type') in ('PRESENCE_SNAPSHOT', 'PRESENCE_DELTA'):
+                                self.master.after(0, lambda m=msg_obj: self.handle_presence(m))
                             else:
                                 self.master.after(0, lambda l=line: self.display_message(l))
                         except json.JSONDecodeError:
@@ -232,6 +245,57 @@ class ChatClient:
         except Exception as e:
             self.display_message(f"[Error menerima file: {e}]")
 
+    # ===== Presence roster =====
+    def handle_presence(self, msg):
+        if msg.get('type') == 'PRESENCE_SNAPSHOT':
+            self.roster.clear()
+            self.roster_nicks = []
+            self.list_roster.delete(0, tk.END)
+            for nick, status in msg.get('users', {}).items():
+                self.roster_set(nick, status)
+            self.roster_version = msg.get('version')
+            return
+
+        if self.roster_version is None:
+            return  # masih menunggu snapshot
+        # Delta hanya valid jika melanjutkan versi yang kita punya
+        if msg.get('from') != self.roster_version:
+            self.request_roster_sync()
+            return
+        for change in msg.get('changes', []):
+            if change.get('op') == 'leave':
+                self.roster_remove(change.get('nick'))
+            else:
+                self.roster_set(change.get('nick'), change.get('status', 'online'))
+        self.roster_version = msg.get('version')
+
+    def roster_set(self, nick, status):
+        label = nick if status == "online" else f"{nick} ({status})"
+        if nick in self.roster:
+            index = bisect.bisect_left(self.roster_nicks, nick)
+            self.list_roster.delete(index)
+        else:
+            index = bisect.bisect_left(self.roster_nicks, nick)
+            self.roster_nicks.insert(index, nick)
+        self.roster[nick] = status
+        self.list_roster.insert(index, label)
+        self.list_roster.itemconfig(index, fg="gray" if status == "away" else "black")
+
+    def roster_remove(self, nick):
+        if nick not in self.roster:
+            return
+        index = bisect.bisect_left(self.roster_nicks, nick)
+        del self.roster_nicks[index]
+        del self.roster[nick]
+        self.list_roster.delete(index)
+
+    def request_roster_sync(self):
+        self.roster_version = None  # abaikan delta sampai snapshot baru datang
+        try:
+            self.sock.sendall((json.dumps({'type': 'PRESENCE_SYNC'}) + "\n").encode('utf-8'))
+        except Exception as e:
+            self.display_message(f"[Gagal sinkron roster: {e}]")
+
     # ===== Tampilkan pesan ke area chat =====
     def display_message(self, message):
         if not message.strip():
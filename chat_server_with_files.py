@@ -14,10 +14,18 @@ from datetime import datetime
 HOST = "127.0.0.1"   # Ubah ke "0.0.0.0" untuk accept dari interface manapun
 PORT = 65432
 
-clients_lock = threading.Lock()
+# RLock karena remove_client() dipanggil dari dalam broadcast() / blok yang sudah memegang lock
+clients_lock = threading.RLock()
 clients = {}  # nickname -> (conn, addr)
 files_dir = "server_files"
 
+# Presence roster (dijaga oleh clients_lock)
+PRESENCE_COALESCE_WINDOW = 0.25  # detik, event presence dalam window ini digabung jadi satu delta
+presence = {}          # nickname -> status ("online"/"away"), state yang sudah di-broadcast
+presence_pending = {}  # nickname -> status terbaru atau None (leave), belum di-broadcast
+presence_version = 0
+presence_timer = None
+
 # Buat directory untuk menyimpan file
 if not os.path.exists(files_dir):
     os.makedirs(files_dir)
@@ -53,6 +61,77 @@ def broadcast_json(msg_obj, exclude_nick=None):
                 log_message(f"[!] Gagal kirim ke {nick}: {e}")
                 remove_client(nick)
 
+def send_presence_snapshot(conn):
+    """Kirim snapshot roster lengkap (versi saat ini) ke satu client."""
+    with clients_lock:
+        snapshot = {
+            'type': 'PRESENCE_SNAPSHOT',
+            'version': presence_version,
+            'users': dict(presence)
+        }
+        conn.sendall((json.dumps(snapshot) + "\n").encode("utf-8"))
+
+def queue_presence(nick, status):
+    """Catat perubahan presence; di-flush sebagai satu delta setelah coalesce window."""
+    global presence_timer
+    with clients_lock:
+        presence_pending[nick] = status
+        if presence_timer is None:
+            presence_timer = threading.Timer(PRESENCE_COALESCE_WINDOW, flush_presence)
+            presence_timer.daemon = True
+            presence_timer.start()
+
+def flush_presence():
+    """Broadcast semua perubahan presence yang tertunda sebagai satu delta berversi."""
+    global presence_timer, presence_version
+    with clients_lock:
+        presence_timer = None
+        changes = []
+        for nick, status in presence_pending.items():
+            old = presence.get(nick)
+            if old == status:
+                continue  # mis. join lalu leave dalam window yang sama
+            if status is None:
+                presence.pop(nick, None)
+                changes.append({'op': 'leave', 'nick': nick})
+            else:
+                presence[nick] = status
+                op = 'join' if old is None else status
+                changes.append({'op': op, 'nick': nick, 'status': status})
+        presence_pending.clear()
+        if not changes:
+            return
+        presence_version += 1
+        broadcast_json({
+            'type': 'PRESENCE_DELTA',
+            'from': presence_version - 1,
+            'version': presence_version,
+            'changes': changes
+        })
+        # Notice teks ikut di-coalesce: satu baris per flush, bukan satu per event
+        joined = [c['nick'] for c in changes if c['op'] == 'join']
+        left = [c['nick'] for c in changes if c['op'] == 'leave']
+        parts = []
+        if joined:
+            parts.append("joined: " + ", ".join(joined))
+        if left:
+            parts.append("left: " + ", ".join(left))
+        if parts:
+            broadcast("[Server] " + "; ".join(parts))
+
+def handle_presence_command(nick, text, conn):
+    """Proses /away dan /back. Return True jika text adalah command presence."""
+    cmd = text.lower()
+    if cmd == "/away":
+        queue_presence(nick, "away")
+        conn.sendall("[Server] You are now marked as away.\n".encode("utf-8"))
+        return True
+    if cmd == "/back":
+        queue_presence(nick, "online")
+        conn.sendall("[Server] You are now marked as online.\n".encode("utf-8"))
+        return True
+    return False
+
 def remove_client(nick):
     """Tutup koneksi dan hapus client dari daftar."""
     with clients_lock:
@@ -63,7 +142,7 @@ def remove_client(nick):
             except Exception:
                 pass
             log_message(f"[i] {nick} disconnected ({addr}).")
-            broadcast(f"[Server] {nick} has left the chat.")
+            queue_presence(nick, None)
 
 def handle_client(conn, addr):
     """Thread handler untuk setiap client."""
@@ -87,9 +166,11 @@ def handle_client(conn, addr):
                 conn.close()
                 return
             clients[nick] = (conn, addr)
+            # snapshot dikirim di bawah lock yang sama dengan flush, jadi versinya konsisten
+            send_presence_snapshot(conn)
+            queue_presence(nick, "online")
 
         log_message(f"[+] {nick} connected from {addr}")
-        broadcast(f"[Server] {nick} has joined the chat.", exclude_nick=nick)
         conn.sendall(f"[Server] Welcome, {nick}! You can now send messages and files.\n".encode("utf-8"))
 
         # loop untuk menerima pesan/file
@@ -121,7 +202,12 @@ def handle_client(conn, addr):
                                 conn.sendall("[Server] Bye!\n".encode("utf-8"))
                                 remove_client(nick)
                                 return
+                            if handle_presence_command(nick, content, conn):
+                                continue
                             broadcast(f"{nick}: {content}", exclude_nick=None)
+                        elif msg_obj.get('type') == 'PRESENCE_SYNC':
+                            # Client kehilangan delta, kirim ulang snapshot
+                            send_presence_snapshot(conn)
                         else:
                             broadcast(f"{nick}: {line}", exclude_nick=None)
                     except json.JSONDecodeError:
@@ -133,6 +219,8 @@ def handle_client(conn, addr):
                         conn.sendall("[Server] Bye!\n".encode("utf-8"))
                         remove_client(nick)
                         return
+                    elif handle_presence_command(nick, line, conn):
+                        continue
                     elif line.startswith("/msg "):
                         # Private message
                         parts = line.split(" ", 2)